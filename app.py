@@ -2,21 +2,89 @@ import streamlit as st
 import os
 import zipfile
 import re
-import glob
 import time
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
-import urllib.request
-import urllib.error
+import threading
+import itertools
+import queue
+import hashlib
+import shutil
+import atexit
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse, unquote_plus
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from yt_dlp import YoutubeDL
 from yt_dlp.utils import sanitize_filename
 import tempfile
 from io import BytesIO
 import logging
-from tenacity import retry, stop_after_attempt, wait_exponential
-from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, CouldNotRetrieveTranscript
-from youtube_transcript_api.formatters import SRTFormatter, WebVTTFormatter
-
-logging.basicConfig(level=logging.DEBUG)
+from functools import lru_cache
+from contextlib import closing, contextmanager
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_not_exception_type
+from youtube_transcript_api import YouTubeTranscriptApi, CouldNotRetrieveTranscript
+
+# The app's own logger only; Streamlit keeps control of root logging. SUBDL_LOGLEVEL
+# (e.g. DEBUG) raises verbosity, and unknown values fall back to WARNING.
+logger = logging.getLogger('youtube_sub_dl')
+_log_level = getattr(logging, os.environ.get('SUBDL_LOGLEVEL', 'WARNING').upper(), None)
+logger.setLevel(_log_level if isinstance(_log_level, int) else logging.WARNING)
+if not logger.handlers:
+    logger.addHandler(logging.StreamHandler())
+    logger.propagate = False
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# YouTube video ids are always 11 URL-safe base64 characters
+_VIDEO_ID_RE = re.compile(r'[A-Za-z0-9_-]{11}')
+_CHANNEL_HANDLE_RE = re.compile(r'^/@[\w.-]+')
+_CHANNEL_PATH_MARKERS = ('/channel/', '/c/', '/user/')
+# Channel root (/@handle, /channel/UC…, /c/name, /user/name) without any tab suffix
+_CHANNEL_BASE_RE = re.compile(r'^/(?:@[\w.-]+|(?:channel|c|user)/[^/]+)')
+# v= / list= values in a query string; first occurrence wins, as with parse_qs
+_QUERY_ID_RE = re.compile(r'(?:^|&)(v|list)=([^&]+)')
+_PLAYLIST_ID_RE = re.compile(r'[A-Za-z0-9_-]+')
+_VTT_TIME_RE = re.compile(r'(\d{2}:\d{2}:\d{2})[.,](\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2})[.,](\d{3})')
+_VTT_BLOCK_SPLIT_RE = re.compile(r'\n\s*\n')
+_VTT_TAG_RE = re.compile(r'<[^>]+>')
+# Inline word timestamps (<00:00:01.234>) and <c>/<v> styling tags left in caption text
+_TAG_STRIP_PATTERN = r'<[\d:.]+>|</?[cv][^>]*>'
+_CUE_INDEX_RE = re.compile(r'^[^\S\n]*\d+[^\S\n]*$', re.MULTILINE)
+# Whole lines that carry no transcript text: cue numbers, SRT/VTT timing lines
+# (VTT ones may have cue settings after the end time), NOTE and WEBVTT headers.
+_SRT_STRIP_PATTERN = (
+    r'^[^\S\n]*(?:\d+|\d{2}:\d{2}:\d{2}[,.]\d{3} --> \d{2}:\d{2}:\d{2}[,.]\d{3}.*|(?:NOTE|WEBVTT).*)[^\S\n]*$'
+    r'|' + _TAG_STRIP_PATTERN
+)
+_SRT_STRIP_RE = re.compile(_SRT_STRIP_PATTERN, re.MULTILINE)
+# Same, plus the rest of any "[Advertisement]" line that clean_subtitle_text removes
+_SRT_CLEAN_STRIP_RE = re.compile(r'(?i:\[Advertisement\])[^\n]*\n|' + _SRT_STRIP_PATTERN, re.MULTILINE)
+# A line break plus the whitespace around it, including any blank lines that follow
+_LINE_BREAKS_RE = re.compile(r'[^\S\n]*\n\s*')
+_AD_RE = re.compile(r'\[Advertisement\].*?\n', re.DOTALL | re.IGNORECASE)
+_EXTRA_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+# One pooled session for every direct HTTP call (transcript API, caption
+# translation), so concurrent workers reuse warm TCP/TLS connections.
+_SESSION = requests.Session()
+# Transport-level retries only (dropped connections, read timeouts on GETs). Status
+# retries are off entirely, including urllib3's Retry-After-driven ones for 413/429/503,
+# and the response is returned rather than raised, so 429s still reach the pacing and
+# backoff code that handles them.
+_SESSION.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=Retry(
+    total=3, backoff_factor=0.3, status=0, raise_on_status=False, respect_retry_after_header=False)))
+_TRANSCRIPT_API = YouTubeTranscriptApi(http_client=_SESSION)
+
+_IO_BUFFER_SIZE = 1 << 20  # big enough that a whole subtitle file usually moves in one syscall
+
+_MIME_TYPES = {'srt': 'text/plain', 'vtt': 'text/vtt', 'txt': 'text/plain'}
+_SUB_MODES = {'Original Language': 'original', 'English Translation': 'en_translation'}
+_URL_TYPE_LABELS = {
+    'playlist': 'Playlist', 'channel': 'Channel',
+    'video': 'Video', 'both': 'Playlist'
+}
 
 LANGUAGE_NAMES = {
     'en': 'English',
@@ -55,28 +123,53 @@ LANGUAGE_NAMES = {
     'ca': 'Català (Catalan)',
 }
 
+@lru_cache(maxsize=128)
 def format_language_option(code):
     return LANGUAGE_NAMES.get(code, code.upper() if code else 'Unknown')
 
+@lru_cache(maxsize=2048)
+def _safe_title(title):
+    """Filesystem-safe, length-capped version of a video/playlist title."""
+    return sanitize_filename(title)[:150]
+
+def _query_ids(query):
+    """(video_id, playlist_id) from a URL query string, percent-decoded like parse_qs.
+    None for whichever is absent or isn't a well-formed id; these end up in URLs and
+    scratch-directory names, so nothing else gets through."""
+    ids = {}
+    for key, value in _QUERY_ID_RE.findall(query):
+        ids.setdefault(key, unquote_plus(value))
+    video_id, playlist_id = ids.get('v'), ids.get('list')
+    if video_id is not None and not _VIDEO_ID_RE.fullmatch(video_id):
+        video_id = None
+    if playlist_id is not None and not _PLAYLIST_ID_RE.fullmatch(playlist_id):
+        playlist_id = None
+    return video_id, playlist_id
+
+def _short_link_id(parsed):
+    """Video id from a youtu.be/<id> path, or None if it isn't a well-formed id."""
+    video_id = unquote_plus(parsed.path.strip('/'))
+    return video_id if _VIDEO_ID_RE.fullmatch(video_id) else None
+
 def is_channel_url(url):
     try:
         parsed = urlparse(url)
         path = parsed.path.rstrip('/')
         return bool(
-            re.match(r'^/@[\w.-]+', path) or
-            any(p in path for p in ['/channel/', '/c/', '/user/'])
+            _CHANNEL_HANDLE_RE.match(path) or
+            any(p in path for p in _CHANNEL_PATH_MARKERS)
         )
     except Exception:
         return False
 
+@st.cache_data(max_entries=128, show_spinner=False)
 def validate_url(url):
     try:
         parsed_url = urlparse(url)
 
         if parsed_url.netloc == 'youtu.be':
-            video_id = parsed_url.path.lstrip('/')
-            query_params = parse_qs(parsed_url.query)
-            playlist_id = query_params.get('list', [None])[0]
+            video_id = _short_link_id(parsed_url)
+            _, playlist_id = _query_ids(parsed_url.query)
             if playlist_id and video_id:
                 return (f"https://www.youtube.com/playlist?list={playlist_id}",
                         f"https://www.youtube.com/watch?v={video_id}", 'both')
@@ -85,18 +178,20 @@ def validate_url(url):
 
         # Detect channel URLs: /@handle, /c/name, /channel/UCxxx, /user/name
         path = parsed_url.path.rstrip('/')
-        channel_patterns = ['/channel/', '/c/', '/user/']
-        is_handle = re.match(r'^/@[\w.-]+', path)
-        is_ch = any(p in path for p in channel_patterns)
+        is_handle = _CHANNEL_HANDLE_RE.match(path)
+        is_ch = any(p in path for p in _CHANNEL_PATH_MARKERS)
         if is_handle or is_ch:
+            # One canonical URL per channel (scheme, host, tab and query dropped) so
+            # get_info_cached hits the same entry however the channel was pasted.
+            base = _CHANNEL_BASE_RE.match(path)
+            if base:
+                return (f"https://www.youtube.com{base.group(0)}/videos", None, 'channel')
             channel_url = url.rstrip('/')
             if not channel_url.endswith('/videos'):
                 channel_url += '/videos'
             return (channel_url, None, 'channel')
 
-        query_params = parse_qs(parsed_url.query)
-        video_id = query_params.get('v', [None])[0]
-        playlist_id = query_params.get('list', [None])[0]
+        video_id, playlist_id = _query_ids(parsed_url.query)
 
         if playlist_id and video_id:
             return (f"https://www.youtube.com/playlist?list={playlist_id}",
@@ -113,33 +208,66 @@ def validate_url(url):
 def extract_video_id(url):
     parsed = urlparse(url)
     if parsed.netloc == 'youtu.be':
-        return parsed.path.lstrip('/')
-    return parse_qs(parsed.query).get('v', [None])[0]
+        return _short_link_id(parsed)
+    return _query_ids(parsed.query)[0]
 
 def get_video_metadata(url, cookies_file=None):
-    """Fetch title and channel name for a single video URL."""
-    ydl_opts = {
-        'quiet': True,
-        'no_warnings': True,
-        'cookiefile': cookies_file,
-    }
-    with YoutubeDL(ydl_opts) as ydl:
+    """Fetch title and channel name for a single video URL: oEmbed when it answers,
+    otherwise one extraction on the shared metadata YoutubeDL."""
+    video_id = extract_video_id(url)
+    info = _oembed_info(video_id) if video_id else None
+    if info is not None:
+        return info.get('title') or 'Unknown Title', info.get('author_name') or 'Unknown Channel'
+    with _get_ydl(cookies_file).borrow() as ydl:
         info = ydl.extract_info(url, download=False)
-        title = info.get('title', 'Unknown Title')
-        channel = info.get('channel', info.get('uploader', 'Unknown Channel'))
-        return title, channel
+    title = info.get('title', 'Unknown Title')
+    channel = info.get('channel', info.get('uploader', 'Unknown Channel'))
+    return title, channel
+
+class NoCaptionsError(ValueError):
+    """The transcript API returned a caption track list and it was empty. This is not
+    raised for TranscriptsDisabled, which only means the API's single client got no
+    captions block; yt-dlp queries other clients and may still find tracks."""
 
 def _pick_original_transcript(transcript_list):
     """Prefer a manually-uploaded (creator-added) transcript since that's always in
     the video's native language. Otherwise fall back to the auto-generated transcript,
     which is also always in the video's spoken/original language."""
-    manual = [t for t in transcript_list if not t.is_generated]
-    if manual:
-        return manual[0]
-    generated = [t for t in transcript_list if t.is_generated]
-    if generated:
-        return generated[0]
-    raise ValueError("No transcript available for this video.")
+    first_generated = None
+    for t in transcript_list:
+        if not t.is_generated:
+            return t
+        if first_generated is None:
+            first_generated = t
+    if first_generated is not None:
+        return first_generated
+    raise NoCaptionsError("No transcript available for this video.")
+
+def _cue_timestamp(seconds, ms_sep):
+    """HH:MM:SS<sep>mmm for a cue boundary given in (float) seconds."""
+    whole = int(seconds)
+    mins, secs = divmod(whole, 60)
+    hours, mins = divmod(mins, 60)
+    ms = int(round((seconds - whole) * 1000, 2))
+    return f"{hours:02d}:{mins:02d}:{secs:02d}{ms_sep}{ms:03d}"
+
+def format_transcript(snippets, format_choice='srt'):
+    """Render fetched transcript snippets as SRT (or WebVTT for 'vtt'). Output matches
+    youtube-transcript-api's SRT/WebVTT formatters — including clamping a cue's end to
+    the next cue's start when they overlap — but builds the cue list in one pass and
+    joins it once."""
+    snippets = list(snippets)
+    vtt = format_choice == 'vtt'
+    ms_sep = '.' if vtt else ','
+    starts = [float(s.start) for s in snippets] + [float('inf')]
+    cues = []
+    for i, snip in enumerate(snippets):
+        start = starts[i]
+        end = min(start + snip.duration, starts[i + 1])
+        timing = f"{_cue_timestamp(start, ms_sep)} --> {_cue_timestamp(end, ms_sep)}"
+        cues.append(f"{timing}\n{snip.text}" if vtt else f"{i + 1}\n{timing}\n{snip.text}")
+    body = "\n\n".join(cues) + "\n"
+    return "WEBVTT\n\n" + body if vtt else body
 
 def get_transcript_api(video_id, format_choice='srt', mode='original'):
     """
@@ -148,43 +276,47 @@ def get_transcript_api(video_id, format_choice='srt', mode='original'):
       'en_translation' -> fetch an English transcript, translating on the fly if needed
     """
     try:
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+        _pace_transcript_requests()
+        transcript_list = _TRANSCRIPT_API.list(video_id)
 
         if mode == 'en_translation':
-            try:
-                transcript = transcript_list.find_transcript(['en'])
+            # One walk over the already-fetched list picks both the best English track
+            # (manual over auto-generated) and the best translation source. Auto-generated
+            # tracks are almost always translatable; manually-uploaded ones often aren't,
+            # so prefer a translatable auto-generated track as the source.
+            english = None
+            base_transcript = None
+            for t in transcript_list:
+                if t.language_code == 'en' and (english is None or (english.is_generated and not t.is_generated)):
+                    english = t
+                if t.is_translatable and (base_transcript is None
+                                          or (t.is_generated and not base_transcript.is_generated)):
+                    base_transcript = t
+
+            if english is not None:
+                transcript = english
                 is_auto = transcript.is_generated
-            except NoTranscriptFound:
-                candidates = list(transcript_list)
-                translatable = [t for t in candidates if t.is_translatable]
-                if not translatable:
-                    raise ValueError(
-                        "No English transcript exists and none of the available tracks can be machine-translated."
-                    )
-                # Auto-generated tracks are almost always translatable; manually-uploaded
-                # ones often aren't, so prefer a translatable auto-generated track first.
-                generated_translatable = [t for t in translatable if t.is_generated]
-                base_transcript = generated_translatable[0] if generated_translatable else translatable[0]
+            elif base_transcript is not None:
                 transcript = base_transcript.translate('en')
                 is_auto = True
+            else:
+                raise ValueError(
+                    "No English transcript exists and none of the available tracks can be machine-translated."
+                )
             lang_code = 'en'
         else:  # 'original'
             transcript = _pick_original_transcript(transcript_list)
             lang_code = transcript.language_code
             is_auto = transcript.is_generated
 
+        _pace_transcript_requests()
         transcript_data = transcript.fetch()
 
-        if format_choice == 'srt':
-            formatter = SRTFormatter()
-        elif format_choice == 'vtt':
-            formatter = WebVTTFormatter()
-        else:
-            formatter = SRTFormatter()
-
-        sub_text = formatter.format_transcript(transcript_data)
+        sub_text = format_transcript(transcript_data, format_choice)
         return sub_text, lang_code, is_auto
 
+    except NoCaptionsError:
+        raise
     except CouldNotRetrieveTranscript as e:
         raise ValueError(f"Access denied (age-restricted?): {str(e)}")
     except Exception as e:
@@ -192,24 +324,29 @@ def get_transcript_api(video_id, format_choice='srt', mode='original'):
 
 def vtt_to_srt(vtt_text):
     """Convert WebVTT cue text into SRT format (numbered cues, comma decimal separator)."""
-    body = re.sub(r'^WEBVTT.*?\n', '', vtt_text, count=1, flags=re.DOTALL)
-    blocks = re.split(r'\n\s*\n', body.strip())
-    time_pattern = re.compile(r'(\d{2}:\d{2}:\d{2})[.,](\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2})[.,](\d{3})')
+    # Drop the WEBVTT signature line; Kind:/Language: header lines are skipped per cue below
+    body = vtt_text.partition('\n')[2] if vtt_text.startswith('WEBVTT') else vtt_text
+    blocks = _VTT_BLOCK_SPLIT_RE.split(body.strip())
     srt_blocks = []
     counter = 1
+    find_timing = _VTT_TIME_RE.search
+    strip_tags = _VTT_TAG_RE.sub
     for block in blocks:
-        m = time_pattern.search(block)
+        m = find_timing(block)
         if not m:
             continue
         start = f"{m.group(1)},{m.group(2)}"
         end = f"{m.group(3)},{m.group(4)}"
         text_lines = []
         for line in block.split('\n'):
-            if time_pattern.search(line) or not line.strip():
+            stripped = line.strip()
+            # '-->' only ever appears on the cue timing line; a substring scan settles it
+            # without running the timing regex on every caption line
+            if not stripped or '-->' in stripped:
                 continue
-            if line.strip().upper().startswith(('NOTE', 'STYLE', 'KIND:', 'LANGUAGE:')):
+            if stripped.upper().startswith(('NOTE', 'STYLE', 'KIND:', 'LANGUAGE:')):
                 continue
-            line = re.sub(r'<[^>]+>', '', line)  # strip vtt tags like <c> and word timestamps
+            line = strip_tags('', line)  # strip vtt tags like <c> and word timestamps
             text_lines.append(line)
         if text_lines:
             srt_blocks.append(f"{counter}\n{start} --> {end}\n" + '\n'.join(text_lines) + "\n")
@@ -220,11 +357,27 @@ _LAST_TRANSLATE_REQUEST_TIME = [0.0]
 _TRANSLATE_MIN_INTERVAL = 1.5  # seconds enforced between consecutive translate requests,
                                 # process-wide, regardless of which loop is calling this
 
+_LAST_TRANSCRIPT_REQUEST_TIME = [0.0]
+_TRANSCRIPT_MIN_INTERVAL = 0.2  # ~5 transcript-API requests/s across all download workers,
+                                # to stay under the rate that gets answered with HTTP 429
+
+_PACE_LOCK = threading.Lock()
+
+def _pace(last_request_time, min_interval):
+    # Reserve the next free slot under the lock, then sleep outside it, so
+    # concurrent download workers queue up instead of all firing at once.
+    with _PACE_LOCK:
+        now = time.monotonic()
+        slot = max(now, last_request_time[0] + min_interval)
+        last_request_time[0] = slot
+    if slot > now:
+        time.sleep(slot - now)
+
 def _pace_translate_requests():
-    elapsed = time.monotonic() - _LAST_TRANSLATE_REQUEST_TIME[0]
-    if elapsed < _TRANSLATE_MIN_INTERVAL:
-        time.sleep(_TRANSLATE_MIN_INTERVAL - elapsed)
-    _LAST_TRANSLATE_REQUEST_TIME[0] = time.monotonic()
+    _pace(_LAST_TRANSLATE_REQUEST_TIME, _TRANSLATE_MIN_INTERVAL)
+
+def _pace_transcript_requests():
+    _pace(_LAST_TRANSCRIPT_REQUEST_TIME, _TRANSCRIPT_MIN_INTERVAL)
 
 def _fetch_translated_caption_text(base_url, tlang='en', max_retries=5):
     """Manually request YouTube's on-the-fly caption translation (tlang param) for a
@@ -237,29 +390,27 @@ def _fetch_translated_caption_text(base_url, tlang='en', max_retries=5):
     new_query = urlencode(qs, doseq=True)
     new_url = urlunparse(parsed._replace(query=new_query))
     headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        'User-Agent': USER_AGENT
     }
 
     for attempt in range(max_retries):
         _pace_translate_requests()
-        req = urllib.request.Request(new_url, headers=headers)
-        try:
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                raw = resp.read().decode('utf-8', errors='replace')
-            if not raw.strip():
-                raise ValueError("YouTube returned an empty translated caption track.")
-            return raw
-        except urllib.error.HTTPError as e:
-            if e.code == 429:
-                if attempt < max_retries - 1:
-                    backoff = min(2 ** attempt * 3, 45)
-                    time.sleep(backoff)
-                    continue
-                raise ValueError(
-                    "YouTube rate-limited the translation requests (HTTP 429) after several "
-                    "retries. Try again in a few minutes, or download fewer videos at once."
-                )
-            raise ValueError(f"HTTP {e.code} fetching translated captions: {e.reason}")
+        resp = _SESSION.get(new_url, headers=headers, timeout=15)
+        if resp.status_code == 429:
+            if attempt < max_retries - 1:
+                backoff = min(2 ** attempt * 3, 45)
+                time.sleep(backoff)
+                continue
+            raise ValueError(
+                "YouTube rate-limited the translation requests (HTTP 429) after several "
+                "retries. Try again in a few minutes, or download fewer videos at once."
+            )
+        if not resp.ok:
+            raise ValueError(f"HTTP {resp.status_code} fetching translated captions: {resp.reason}")
+        raw = resp.content.decode('utf-8', errors='replace')
+        if not raw.strip():
+            raise ValueError("YouTube returned an empty translated caption track.")
+        return raw
     raise ValueError("Failed to fetch translated captions after multiple retries.")
 
 def get_subtitles_yt_dlp(video_url, format_choice, cookies_file, temp_dir, mode='original'):
@@ -271,10 +422,15 @@ def get_subtitles_yt_dlp(video_url, format_choice, cookies_file, temp_dir, mode=
         'outtmpl': os.path.join(temp_dir, '%(title)s.%(ext)s'),
         'quiet': True,
         'no_warnings': True,
-        'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'user_agent': USER_AGENT,
         'cookiefile': cookies_file,
         'restrict_filenames': True,
         'ignoreerrors': True,
+        # Nobody sees yt-dlp's console output here; skip rendering the per-chunk
+        # progress line and terminal-title/colour escapes for each subtitle file
+        'noprogress': True,
+        'no_color': True,
+        'consoletitle': False,
     }
 
     probe_opts = {'quiet': True, 'no_warnings': True, 'cookiefile': cookies_file, 'skip_download': True}
@@ -288,11 +444,28 @@ def get_subtitles_yt_dlp(video_url, format_choice, cookies_file, temp_dir, mode=
         ydl_opts = {**base_opts, 'subtitleslangs': [lang_code], 'automaticsubslangs': [lang_code],
                     'subtitlesformat': f'{dl_format}/vtt/srv3/srv1/best'}
         with YoutubeDL(ydl_opts) as ydl:
-            ydl.download([video_url])
+            # Re-process the probe's info dict instead of ydl.download(), which would run
+            # the whole extractor against YouTube again. Private keys (requested_*,
+            # filepath, __*) are stripped as --load-info-json does, so the second pass
+            # recomputes them for this instance's options.
+            result = ydl.process_ie_result(ydl.sanitize_info(info, remove_private_keys=True),
+                                           download=True)
+        # yt-dlp records where it wrote each requested track; the directory scan below
+        # is only for when it didn't (older releases, a post-processor renaming the file)
+        written = ((result or {}).get('requested_subtitles') or {}).get(lang_code) or {}
+        if written.get('filepath') and os.path.exists(written['filepath']):
+            return [written['filepath']]
+        # One directory listing instead of a glob per extension; preferred formats first
+        rank = {}
+        for i, ext in enumerate([dl_format, 'vtt', 'ttml', 'srv3', 'srv2', 'srv1', 'json3']):
+            rank.setdefault(ext, i)
+        suffix = f'.{lang_code}'
         found = []
-        for ext in [dl_format, 'vtt', 'ttml', 'srv3', 'srv2', 'srv1', 'json3']:
-            found += glob.glob(os.path.join(temp_dir, f'*.{lang_code}.{ext}'))
-        return found
+        for name in os.listdir(temp_dir):
+            stem, _, ext = name.rpartition('.')
+            if ext in rank and stem.endswith(suffix) and not name.startswith('.'):
+                found.append((rank[ext], os.path.join(temp_dir, name)))
+        return [path for _, path in sorted(found)]
 
     if mode == 'en_translation':
         # 1) If yt-dlp already lists a ready-made 'en' track (native or pre-listed
@@ -301,7 +474,7 @@ def get_subtitles_yt_dlp(video_url, format_choice, cookies_file, temp_dir, mode=
             files = _download_lang('en')
             if files:
                 sub_path = files[0]
-                with open(sub_path, 'r', encoding='utf-8') as f:
+                with open(sub_path, 'r', encoding='utf-8', buffering=_IO_BUFFER_SIZE) as f:
                     sub_text = f.read()
                 os.remove(sub_path)
                 if sub_path.endswith('.vtt') and format_choice != 'txt' and format_choice == 'srt':
@@ -344,7 +517,7 @@ def get_subtitles_yt_dlp(video_url, format_choice, cookies_file, temp_dir, mode=
             raise ValueError("No subtitles found")
 
         sub_path = files[0]
-        with open(sub_path, 'r', encoding='utf-8') as f:
+        with open(sub_path, 'r', encoding='utf-8', buffering=_IO_BUFFER_SIZE) as f:
             sub_text = f.read()
         os.remove(sub_path)
         if sub_path.endswith('.vtt') and format_choice == 'srt':
@@ -354,36 +527,254 @@ def get_subtitles_yt_dlp(video_url, format_choice, cookies_file, temp_dir, mode=
 
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+_INNERTUBE_BROWSE_URL = 'https://www.youtube.com/youtubei/v1/browse?prettyPrint=false'
+_INNERTUBE_CONTEXT = {'client': {'clientName': 'WEB', 'clientVersion': '2.20240101.00.00', 'hl': 'en'}}
+
+def _innertube_text(node):
+    if 'simpleText' in node:
+        return node['simpleText']
+    return ''.join(run.get('text', '') for run in node.get('runs', []))
+
+def _split_playlist_items(items):
+    """Split one page of playlistVideoListRenderer items into (video_id, title) pairs
+    and the continuation token for the next page, if there is one."""
+    entries, token = [], None
+    for item in items:
+        video = item.get('playlistVideoRenderer')
+        if video and video.get('videoId'):
+            entries.append((video['videoId'], _innertube_text(video.get('title', {}))))
+        elif 'continuationItemRenderer' in item:
+            token = item['continuationItemRenderer']['continuationEndpoint']['continuationCommand']['token']
+    return entries, token
+
+def _innertube_browse(payload):
+    resp = _SESSION.post(_INNERTUBE_BROWSE_URL, json={'context': _INNERTUBE_CONTEXT, **payload},
+                         headers={'User-Agent': USER_AGENT}, timeout=15)
+    resp.raise_for_status()
+    return resp.json()
+
+def get_playlist_entries_innertube(playlist_id):
+    """List a playlist through YouTube's own InnerTube browse endpoint — one JSON POST
+    per ~100 videos instead of a full yt-dlp extractor run. Returns (entries, title) like
+    get_info(); raises (KeyError/IndexError/ValueError/requests errors) on any response
+    it doesn't recognise so the caller can fall back to yt-dlp."""
+    data = _innertube_browse({'browseId': f'VL{playlist_id}'})
+    tab = data['contents']['twoColumnBrowseResultsRenderer']['tabs'][0]['tabRenderer']
+    section = tab['content']['sectionListRenderer']['contents'][0]['itemSectionRenderer']
+    items = section['contents'][0]['playlistVideoListRenderer']['contents']
+    title = data.get('metadata', {}).get('playlistMetadataRenderer', {}).get('title') or 'subtitles'
+
+    entries, token = _split_playlist_items(items)
+    while token:
+        # A token means more videos exist: a continuation page we can't read must fail
+        # loudly (KeyError/IndexError/ValueError) rather than return a truncated list
+        data = _innertube_browse({'continuation': token})
+        items = data['onResponseReceivedActions'][0]['appendContinuationItemsAction']['continuationItems']
+        page, token = _split_playlist_items(items)
+        if not page:
+            raise ValueError("InnerTube continuation page had no playlist videos")
+        entries.extend(page)
+    return [(vid, t or f'video_{i+1}') for i, (vid, t) in enumerate(entries)], title
+
+_YDL_POOL_SIZE = 4  # concurrent metadata extractions per option set, across all sessions
+
+class _YdlPool:
+    """Up to _YDL_POOL_SIZE long-lived YoutubeDL instances sharing one option set.
+    A YoutubeDL isn't thread-safe, so each instance is lent to one thread at a time;
+    Streamlit sessions run on their own threads and no longer queue behind one lock."""
+
+    def __init__(self, ydl_opts):
+        self._opts = ydl_opts
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(_YDL_POOL_SIZE)
+        self._created = []
+        self._cookie_dir = None
+        if ydl_opts.get('cookiefile'):
+            # close() saves the cookie jar back to cookiefile; keep that off the upload
+            # that other sessions and workers read from
+            self._cookie_dir = tempfile.mkdtemp(prefix='subdl_ydl_')
+            private_cookies = os.path.join(self._cookie_dir, 'cookies.txt')
+            shutil.copyfile(ydl_opts['cookiefile'], private_cookies)
+            self._opts = {**ydl_opts, 'cookiefile': private_cookies}
+
+    @contextmanager
+    def borrow(self):
+        with self._slots:
+            try:
+                ydl = self._idle.get_nowait()
+            except queue.Empty:
+                ydl = YoutubeDL(self._opts)
+                self._created.append(ydl)
+            try:
+                yield ydl
+            finally:
+                self._idle.put(ydl)
+
+    def close(self):
+        for ydl in self._created:
+            ydl.close()
+        if self._cookie_dir:
+            shutil.rmtree(self._cookie_dir, ignore_errors=True)
+
+@st.cache_resource(max_entries=8, show_spinner=False, on_release=_YdlPool.close)
+def _get_ydl(cookies_file=None, extract_flat=False):
+    """Return the shared _YdlPool for metadata-only extraction with these options.
+    Building a YoutubeDL loads its extractor registry, so instances are kept as a
+    Streamlit resource shared by every session; evicted or cleared pools are closed."""
+    ydl_opts = {'quiet': True, 'no_warnings': True, 'cookiefile': cookies_file}
+    if extract_flat:
+        ydl_opts.update({'extract_flat': True, 'user_agent': USER_AGENT})
+    return _YdlPool(ydl_opts)
+
+_OEMBED_URL = 'https://www.youtube.com/oembed'
+
+def _oembed_info(video_id):
+    """Title/author for a single video from YouTube's oEmbed endpoint — one ~200-byte
+    response instead of a full yt-dlp extractor run. Returns None when the endpoint
+    won't answer (private/age-restricted videos, network trouble) so callers can fall
+    back to yt-dlp."""
+    try:
+        r = _SESSION.get(_OEMBED_URL, params={
+            'url': f'https://www.youtube.com/watch?v={video_id}',
+            'format': 'json',
+        }, headers={'User-Agent': USER_AGENT}, timeout=5)
+        if r.status_code != 200:
+            return None
+        return r.json()
+    except (requests.RequestException, ValueError):
+        return None
+
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10),
+       retry=retry_if_not_exception_type(ValueError))
 def get_info(url, is_playlist=False, cookies_file=None):
     if is_playlist or is_channel_url(url):
-        ydl_opts = {
-            'extract_flat': True,
-            'quiet': True,
-            'no_warnings': True,
-            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'cookiefile': cookies_file,
-        }
-        with YoutubeDL(ydl_opts) as ydl:
+        playlist_id = _query_ids(urlparse(url).query)[1]
+        if playlist_id:
+            try:
+                entries, title = get_playlist_entries_innertube(playlist_id)
+                if entries:
+                    return entries, title
+            except (requests.RequestException, ValueError, KeyError, IndexError, TypeError):
+                logger.debug("InnerTube listing failed for %s, using yt-dlp", playlist_id, exc_info=True)
+        with _get_ydl(cookies_file, extract_flat=True).borrow() as ydl:
             result = ydl.extract_info(url, download=False)
-            entries = result.get('entries', [])
-            # Channels can return nested entries (tabs → videos)
-            if entries and isinstance(entries[0], dict) and 'entries' in entries[0]:
-                entries = entries[0].get('entries', [])
-            video_ids = [e.get('id') for e in entries if e and e.get('id')]
-            titles = [e.get('title', f'video_{i+1}') for i, e in enumerate(entries) if e and e.get('id')]
-            title = result.get('title', 'subtitles')
-            return list(zip(video_ids, titles)), title
+        entries = result.get('entries', [])
+        # Channels can return nested entries (tabs → videos)
+        if entries and isinstance(entries[0], dict) and 'entries' in entries[0]:
+            entries = entries[0].get('entries', [])
+        video_ids = [e.get('id') for e in entries if e and e.get('id')]
+        titles = [e.get('title', f'video_{i+1}') for i, e in enumerate(entries) if e and e.get('id')]
+        title = result.get('title', 'subtitles')
+        return list(zip(video_ids, titles)), title
     else:
         video_id = extract_video_id(url)
         if not video_id:
             raise ValueError("Invalid video URL")
-        ydl_opts = {'quiet': True, 'no_warnings': True, 'cookiefile': cookies_file}
-        with YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            title = info.get('title', 'video_subtitles')
+        info = _oembed_info(video_id)
+        if info is None:
+            with _get_ydl(cookies_file).borrow() as ydl:
+                info = ydl.extract_info(url, download=False)
+        title = info.get('title') or 'video_subtitles'
         return [(video_id, title)], title
 
+# On-disk layer under get_info_cached so listings survive Streamlit restarts
+_META_CACHE_TTL = 24 * 3600
+
+@lru_cache(maxsize=1)
+def _meta_cache_path():
+    """Database path inside a 0700 per-user cache dir, so other local users can't plant
+    listings in it or lock it. Falls back to a private per-process temp dir (no
+    persistence across restarts) when the cache dir isn't usable or isn't ours."""
+    cache_dir = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                             'youtube_sub_dl')
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        info = os.stat(cache_dir)
+        if hasattr(os, 'getuid') and info.st_uid != os.getuid():
+            raise PermissionError(f"{cache_dir} is owned by another user")
+        if info.st_mode & 0o077:
+            os.chmod(cache_dir, 0o700)
+    except OSError:
+        logger.debug("Metadata cache dir unusable, using a private temp dir", exc_info=True)
+        cache_dir = tempfile.mkdtemp(prefix='subdl_meta_')
+        atexit.register(shutil.rmtree, cache_dir, ignore_errors=True)
+    return os.path.join(cache_dir, 'meta.sqlite3')
+
+_META_CACHE_SCHEMA = 1  # bump when the stored value format changes; older tables are dropped
+
+def _meta_cache_db():
+    conn = sqlite3.connect(_meta_cache_path(), timeout=5)
+    try:
+        if conn.execute('PRAGMA user_version').fetchone()[0] != _META_CACHE_SCHEMA:
+            with conn:
+                conn.execute('DROP TABLE IF EXISTS info')
+                conn.execute('CREATE TABLE info (key TEXT PRIMARY KEY, ts REAL, value TEXT)')
+                conn.execute(f'PRAGMA user_version = {_META_CACHE_SCHEMA}')
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+def _decode_meta(value):
+    """(entries, title) from a stored row; ValueError/TypeError if it isn't that shape."""
+    entries, title = json.loads(value)
+    entries = [(str(video_id), str(video_title)) for video_id, video_title in entries]
+    if not isinstance(title, str):
+        raise TypeError("title is not a string")
+    return entries, title
+
+def _meta_cache_get(key):
+    try:
+        # closing() releases the handle; the connection's own with-block is the transaction
+        with closing(_meta_cache_db()) as conn, conn:
+            row = conn.execute('SELECT value FROM info WHERE key = ? AND ts > ?',
+                               (key, time.time() - _META_CACHE_TTL)).fetchone()
+            if row is None:
+                return None
+            try:
+                return _decode_meta(row[0])
+            except (ValueError, TypeError):
+                conn.execute('DELETE FROM info WHERE key = ?', (key,))
+                logger.debug("Dropped undecodable metadata cache row for %s", key, exc_info=True)
+                return None
+    except sqlite3.Error:
+        logger.debug("Metadata cache read failed", exc_info=True)
+        return None
+
+def _meta_cache_put(key, result):
+    try:
+        with closing(_meta_cache_db()) as conn, conn:
+            conn.execute('INSERT OR REPLACE INTO info VALUES (?, ?, ?)',
+                         (key, time.time(), json.dumps(result)))
+    except sqlite3.Error:
+        logger.debug("Metadata cache write failed", exc_info=True)
+
+def clear_meta_cache():
+    try:
+        with closing(_meta_cache_db()) as conn, conn:
+            conn.execute('DELETE FROM info')
+    except sqlite3.Error:
+        logger.debug("Metadata cache clear failed", exc_info=True)
+    get_info_cached.clear()
+
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def get_info_cached(url, is_playlist=False, cookies_hash=None, _cookies_file=None):
+    """get_info() memoized across Streamlit reruns and repeat clicks. Cookies are keyed
+    by the uploaded file's content hash; the temp-file path (underscore-prefixed, so
+    Streamlit doesn't hash it) only tells yt-dlp where to read them.
+
+    Cookie-less lookups are also kept on disk for a day. Anything fetched with
+    cookies may be private, so it stays in memory only."""
+    key = f"{url}|{bool(is_playlist)}"
+    if cookies_hash is None:
+        cached = _meta_cache_get(key)
+        if cached is not None:
+            return cached
+    result = get_info(url, is_playlist, _cookies_file)
+    if cookies_hash is None:
+        _meta_cache_put(key, result)
+    return result
+
 
 # sp= values are YouTube's own search "Sort by" filter parameters (captured
 # from the live results?...&sp=... URL). None means "let ytsearch use YouTube's
@@ -393,8 +784,15 @@ _SEARCH_SORT_SP = {
     'most_viewed': 'CAMSAhAB',  # Sort by: View count (all-time)
     'newest': 'CAI=',           # Sort by: Upload date (newest first)
 }
+_SEARCH_SORT_MODES = {
+    "Relevance": "relevance",
+    "Most Viewed": "most_viewed",
+    "Newest First": "newest",
+}
+_SEARCH_SORT_LABELS = {"relevance": "relevance", "most_viewed": "most viewed", "newest": "newest"}
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10),
+       retry=retry_if_not_exception_type(ValueError))
 def get_search_info(query, max_results, cookies_file=None, sort_mode='relevance'):
     """Search YouTube for `query` and return the top `max_results` videos as
     a list of (video_id, title) tuples.
@@ -409,134 +807,203 @@ def get_search_info(query, max_results, cookies_file=None, sort_mode='relevance'
     max_results = max(1, min(int(max_results), 500))
     sp_value = _SEARCH_SORT_SP.get(sort_mode)
 
-    ydl_opts = {
-        'extract_flat': True,
-        'quiet': True,
-        'no_warnings': True,
-        'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'cookiefile': cookies_file,
-    }
-
     if sp_value is None:
         # Plain relevance search: yt-dlp's dedicated search extractor paginates
         # on its own until it has N results.
         search_target = f"ytsearch{max_results}:{query}"
+        playlistend = None
     else:
         # Sorted search: hit a real youtube.com/results URL carrying YouTube's
         # own 'sp' sort filter, and cap how many entries get pulled from it.
         params = urlencode({'search_query': query, 'sp': sp_value})
         search_target = f"https://www.youtube.com/results?{params}"
-        ydl_opts['playlistend'] = max_results
+        playlistend = max_results
 
-    with YoutubeDL(ydl_opts) as ydl:
-        result = ydl.extract_info(search_target, download=False)
-        entries = result.get('entries', []) if result else []
-        entries = [e for e in entries if e and e.get('id')][:max_results]
-        video_ids = [e.get('id') for e in entries]
-        titles = [e.get('title', f'video_{i+1}') for i, e in enumerate(entries)]
-        return list(zip(video_ids, titles))
+    with _get_ydl(cookies_file, extract_flat=True).borrow() as ydl:
+        # The result cap varies per search, so it's set on the borrowed instance for this
+        # call only rather than becoming part of the cached pool's key
+        ydl.params['playlistend'] = playlistend
+        try:
+            result = ydl.extract_info(search_target, download=False)
+        finally:
+            ydl.params.pop('playlistend', None)
+    entries = result.get('entries', []) if result else []
+    entries = [e for e in entries if e and e.get('id')][:max_results]
+    video_ids = [e.get('id') for e in entries]
+    titles = [e.get('title', f'video_{i+1}') for i, e in enumerate(entries)]
+    return list(zip(video_ids, titles))
 
 
 def convert_srt_to_txt(srt_text):
-    lines = srt_text.split('\n')
-    txt_lines = []
-    for line in lines:
-        line = line.strip()
-        if re.match(r'^\d+$', line):
-            continue
-        if re.match(r'^\d{2}:\d{2}:\d{2}[,\.]\d{3} --> \d{2}:\d{2}:\d{2}[,\.]\d{3}$', line):
-            continue
-        if re.match(r'^\d{2}:\d{2}:\d{2}\.\d{3} --> \d{2}:\d{2}:\d{2}\.\d{3}', line):
-            continue
-        if line.startswith('NOTE') or line.startswith('WEBVTT') or not line:
-            continue
-        line = re.sub(r'<[\d:.]+>', '', line)
-        line = re.sub(r'</?[cv][^>]*>', '', line)
-        if line:
-            txt_lines.append(line)
-    return '\n'.join(txt_lines) + '\n'
+    # One pass drops cue numbers, timing lines, NOTE/WEBVTT lines and inline tags;
+    # a second trims each remaining line and squeezes out the blank ones.
+    text = _SRT_STRIP_RE.sub('', srt_text)
+    return _LINE_BREAKS_RE.sub('\n', text).strip() + '\n'
+
+def srt_to_clean_txt(srt_text):
+    """clean_subtitle_text() followed by convert_srt_to_txt(), done as one pass over
+    the text instead of two."""
+    text = _SRT_CLEAN_STRIP_RE.sub('', srt_text)
+    return _LINE_BREAKS_RE.sub('\n', text).strip() + '\n'
 
 def clean_subtitle_text(text):
-    text = re.sub(r'\[Advertisement\].*?\n', '', text, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _AD_RE.sub('', text)
+    # The blank-line regex starts a match attempt at every newline; a plain substring
+    # scan tells us first whether there's any 3+ newline run for it to collapse
+    if '\n\n\n' in text:
+        text = _EXTRA_BLANK_LINES_RE.sub('\n\n', text)
     return text.strip()
 
-def combine_subtitles(subtitle_files, output_dir, title, format_choice):
-    safe_title = sanitize_filename(title)[:150]
-    combined_file = os.path.join(output_dir, f"{safe_title}_combined.{format_choice}")
-    cue_index = 1
-    with open(combined_file, 'w', encoding='utf-8') as outfile:
-        for video_title, sub_text in subtitle_files:
-            sep = f"\n\n=== {video_title} ===\n\n" if format_choice != 'txt' else f"\n\n### {video_title} ###\n\n"
-            outfile.write(sep)
-            if format_choice in ['srt', 'vtt']:
-                for line in sub_text.split('\n'):
-                    if re.match(r'^\d+$', line.strip()):
-                        outfile.write(f"{cue_index}\n")
-                        cue_index += 1
-                    else:
-                        outfile.write(line + '\n')
-            else:
-                outfile.write(sub_text + '\n')
-    return combined_file
+def combine_subtitles(subtitle_files, title, format_choice, renumber_cues=True):
+    safe_title = _safe_title(title)
+    # Cue numbers keep counting across videos so the combined file stays strictly
+    # sequential; with renumber_cues off each video's numbering is kept as-is, which
+    # most players accept and which skips a regex pass over every file.
+    cue_numbers = itertools.count(1)
+    parts = []
+    for video_title, sub_text in subtitle_files:
+        sep = f"\n\n=== {video_title} ===\n\n" if format_choice != 'txt' else f"\n\n### {video_title} ###\n\n"
+        parts.append(sep)
+        if renumber_cues and format_choice in ['srt', 'vtt']:
+            sub_text = _CUE_INDEX_RE.sub(lambda m: str(next(cue_numbers)), sub_text)
+        parts.append(sub_text + '\n')
+    return ''.join(parts).encode('utf-8'), f"{safe_title}_combined.{format_choice}"
 
 def create_zip(subtitle_files, title, format_choice):
     zip_buffer = BytesIO()
-    safe_title = sanitize_filename(title)[:150]
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+    safe_title = _safe_title(title)
+    # Level 1 is several times faster than the default 6 and barely larger on plain text
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
         for video_title, sub_text in subtitle_files:
-            filename = f"{sanitize_filename(video_title)[:150]}.{format_choice}"
+            filename = f"{_safe_title(video_title)}.{format_choice}"
             zipf.writestr(filename, sub_text.encode('utf-8'))
     zip_buffer.seek(0)
     return zip_buffer, f"{safe_title}_subtitles.zip"
 
-@retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=1, max=10))
-def download_subtitles(url, format_choice, temp_dir, is_playlist, progress_bar, total_videos,
-                       clean_transcript, cookies_file=None, sub_mode='original'):
-    subtitle_files = []
-    entries, title = get_info(url, is_playlist, cookies_file)
-    if not entries:
-        st.error("No videos found.")
-        return temp_dir, title, subtitle_files
-
-    for i, (video_id, video_title) in enumerate(entries):
-        video_url = f"https://www.youtube.com/watch?v={video_id}"
-        try:
-            try:
-                sub_text, lang_code, is_auto = get_transcript_api(video_id, format_choice, sub_mode)
-                fallback_used = False
-            except Exception:
-                sub_text, lang_code, is_auto = get_subtitles_yt_dlp(
-                    video_url, format_choice, cookies_file, temp_dir, sub_mode)
-                fallback_used = True
-                if not cookies_file:
-                    st.info(f"Used yt-dlp fallback for '{video_title}'")
-
-            if clean_transcript:
-                sub_text = clean_subtitle_text(sub_text)
-            if format_choice == 'txt':
-                sub_text = convert_srt_to_txt(sub_text)
-
-            subtitle_files.append((video_title, sub_text))
-            lang_name = format_language_option(lang_code)
-            auto_note = ' (Auto-generated)' if is_auto else ''
-            source_note = ' (via yt-dlp)' if fallback_used else ''
-            st.info(f"✓ '{video_title}' — {lang_name}{auto_note}{source_note}")
-        except ValueError as ve:
-            error_msg = str(ve).lower()
-            if "age-restricted" in error_msg or "access denied" in error_msg:
-                st.warning(f"'{video_title}' is age-restricted. Upload cookies to access.")
-            else:
-                st.warning(f"No subs for '{video_title}': {str(ve)}")
-        except Exception as e:
-            st.warning(f"Error for '{video_title}': {str(e)}")
-
-        progress_bar.progress((i + 1) / total_videos)
+_MAX_FETCH_WORKERS = 8  # enough to overlap network waits without tripping YouTube's throttling
 
-    return temp_dir, title, subtitle_files
+def fetch_subtitle(video_id, format_choice, cookies_file, temp_dir, sub_mode, clean_transcript):
+    """Fetch and post-process one video's subtitles: transcript API first, yt-dlp as the
+    fallback. Returns (sub_text, lang_code, is_auto, fallback_used). Runs on a worker
+    thread, so it must not call into Streamlit."""
+    if not video_id or not _VIDEO_ID_RE.fullmatch(video_id):
+        raise ValueError(f"Invalid video ID: {video_id!r}")
+    try:
+        sub_text, lang_code, is_auto = get_transcript_api(video_id, format_choice, sub_mode)
+        fallback_used = False
+    except Exception as e:
+        # Only an empty track list the API actually returned is final without cookies;
+        # members-only or consent-gated videos may still serve tracks with them
+        if isinstance(e, NoCaptionsError) and not cookies_file:
+            raise
+        # Private scratch dir per task (not per id: the same video can be queued twice):
+        # the yt-dlp fallback scans for *.<lang>.<ext> and would otherwise pick up
+        # files written by another worker.
+        video_dir = tempfile.mkdtemp(dir=temp_dir)
+        # YoutubeDL.close() rewrites its cookie file in place, so concurrent fallbacks
+        # each get their own copy rather than truncating the shared one under each other
+        worker_cookies = None
+        if cookies_file:
+            worker_cookies = os.path.join(video_dir, 'cookies.txt')
+            shutil.copyfile(cookies_file, worker_cookies)
+        sub_text, lang_code, is_auto = get_subtitles_yt_dlp(
+            f"https://www.youtube.com/watch?v={video_id}", format_choice, worker_cookies, video_dir, sub_mode)
+        fallback_used = True
+
+    if format_choice == 'txt':
+        sub_text = srt_to_clean_txt(sub_text) if clean_transcript else convert_srt_to_txt(sub_text)
+    elif clean_transcript:
+        sub_text = clean_subtitle_text(sub_text)
+    return sub_text, lang_code, is_auto, fallback_used
+
+def fetch_all_subtitles(entries, format_choice, cookies_file, temp_dir, sub_mode, clean_transcript,
+                        progress_bar, channels=None):
+    """Fetch subtitles for every (video_id, video_title) in `entries` on a thread pool.
+    Progress updates are issued from the calling script thread as each video finishes;
+    per-video status is collected and rendered as one table at the end rather than one
+    message element per video; `channels`, if given, is aligned with `entries` and adds
+    a Channel column. Returns a list aligned with `entries` holding each video's
+    subtitle text, or None where nothing could be fetched."""
+    total = len(entries)
+    results = [None] * total
+    status_rows = [None] * total
+    update_progress = make_progress_updater(progress_bar, total)
+    with ThreadPoolExecutor(max_workers=max(1, min(_MAX_FETCH_WORKERS, total))) as executor:
+        futures = {
+            executor.submit(fetch_subtitle, video_id, format_choice, cookies_file, temp_dir,
+                            sub_mode, clean_transcript): i
+            for i, (video_id, _) in enumerate(entries)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            video_title = entries[i][1]
+            try:
+                sub_text, lang_code, is_auto, fallback_used = future.result()
+                results[i] = sub_text
+                lang_name = format_language_option(lang_code)
+                auto_note = ' (Auto-generated)' if is_auto else ''
+                source_note = ' (via yt-dlp)' if fallback_used else ''
+                status = ('✓', f"{lang_name}{auto_note}{source_note}")
+            except ValueError as ve:
+                msg = str(ve).lower()
+                if "age-restricted" in msg or "access denied" in msg:
+                    status = ('⚠️', "Age-restricted. Upload cookies to access.")
+                else:
+                    status = ('⚠️', f"No subs: {str(ve)}")
+            except Exception as e:
+                status = ('⚠️', f"Error: {str(e)}")
+            row = {'Status': status[0], 'Video': video_title}
+            if channels is not None:
+                row['Channel'] = channels[i]
+            row['Details'] = status[1]
+            status_rows[i] = row
+
+            update_progress(done)
+    if status_rows:
+        st.dataframe(status_rows, width="stretch", hide_index=True)
+    return results
+
+_PROGRESS_MIN_INTERVAL = 0.1  # seconds; caps progress-bar pushes at ~10 Hz
+
+def make_progress_updater(progress_bar, total):
+    """Return an update(done) callback that pushes to `progress_bar` only every ~2% of
+    `total` and at most ~10 times a second (always on the last item), so large or
+    fast-completing downloads don't send one websocket message per video."""
+    last_push = [0.0]
+
+    def update(done):
+        now = time.monotonic()
+        if done == total or (done % max(1, total // 50) == 0
+                             and now - last_push[0] >= _PROGRESS_MIN_INTERVAL):
+            progress_bar.progress(done / total)
+            last_push[0] = now
+    return update
+
+@lru_cache(maxsize=1)
+def _cookie_dir():
+    """Private (0700) per-process directory for uploaded cookies, removed at exit."""
+    path = tempfile.mkdtemp(prefix='subdl_cookies_')
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+def materialize_cookies(cookies_bytes, cookies_hash):
+    """Path of an on-disk copy of the uploaded cookies for yt-dlp. The name is derived
+    from the content hash, so reruns (and other sessions) with the same upload reuse
+    the existing file instead of writing a fresh temp file each time. Written to a
+    0600 mkstemp file and renamed into place, so readers never see a partial file.
+    Nothing that runs yt-dlp writes back to it: each user of the cookies works on
+    its own copy."""
+    cookie_dir = _cookie_dir()
+    path = os.path.join(cookie_dir, f"cookies_{cookies_hash}.txt")
+    if not os.path.exists(path):
+        fd, tmp_path = tempfile.mkstemp(dir=cookie_dir, suffix='.part')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(cookies_bytes)
+        os.replace(tmp_path, path)
+    return path
 
 def get_mime_type(format_choice):
-    return {'srt': 'text/plain', 'vtt': 'text/vtt', 'txt': 'text/plain'}.get(format_choice, 'text/plain')
+    return _MIME_TYPES.get(format_choice, 'text/plain')
 
 
 # ─── Multi-video helpers ──────────────────────────────────────────────────────
@@ -546,11 +1013,7 @@ def get_multi_video_info(video_url, cookies_file=None):
     video_id = extract_video_id(video_url)
     if not video_id:
         raise ValueError(f"Could not extract video ID from: {video_url}")
-    ydl_opts = {'quiet': True, 'no_warnings': True, 'cookiefile': cookies_file}
-    with YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(video_url, download=False)
-        title = info.get('title', 'Unknown Title')
-        channel = info.get('channel', info.get('uploader', 'Unknown Channel'))
+    title, channel = get_video_metadata(video_url, cookies_file)
     return video_id, title, channel
 
 
@@ -730,11 +1193,7 @@ def main():
                 "Newest First: sorted by upload date."
             ),
         )
-        search_sort_mode = {
-            "Relevance": "relevance",
-            "Most Viewed": "most_viewed",
-            "Newest First": "newest",
-        }[search_sort_display]
+        search_sort_mode = _SEARCH_SORT_MODES[search_sort_display]
         col_n, _ = st.columns([1, 2])
         with col_n:
             search_max_results = st.number_input(
@@ -756,13 +1215,17 @@ def main():
                 "Subtitle Format", ["srt", "vtt", "txt"], horizontal=True, key="format_choice"
             )
             clean_transcript = st.checkbox("Clean Transcript", value=True, key="clean_transcript")
+            renumber_cues = st.checkbox(
+                "Renumber cues in combined file", value=False, key="renumber_cues",
+                disabled=format_choice == 'txt',
+            )
 
         with col_b:
             lang_mode_display = st.radio(
                 "Subtitle Language", ['Original Language', 'English Translation'],
                 horizontal=True, key="lang_mode"
             )
-            sub_mode = {'Original Language': 'original', 'English Translation': 'en_translation'}[lang_mode_display]
+            sub_mode = _SUB_MODES[lang_mode_display]
 
         st.markdown("---")
         st.markdown(
@@ -772,11 +1235,15 @@ def main():
             "3. Export as `cookies.txt` and upload below."
         )
         uploaded_file = st.file_uploader("Upload Cookies (Optional)", type=["txt"], key="cookies_upload")
+        if st.button("Clear metadata cache", help="Forget saved playlist/channel listings and video titles"):
+            clear_meta_cache()
+            st.success("Metadata cache cleared.")
         cookies_file = None
+        cookies_hash = None
         if uploaded_file:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as tmp:
-                tmp.write(uploaded_file.read())
-                cookies_file = tmp.name
+            cookies_bytes = uploaded_file.getvalue()
+            cookies_hash = hashlib.blake2b(cookies_bytes, digest_size=16).hexdigest()
+            cookies_file = materialize_cookies(cookies_bytes, cookies_hash)
 
     # =========================================================================
     # Download button
@@ -808,43 +1275,16 @@ def main():
                 return
 
             total_videos = len(entries)
-            sort_label = {"relevance": "relevance", "most_viewed": "most viewed", "newest": "newest"}[search_sort_mode]
+            sort_label = _SEARCH_SORT_LABELS[search_sort_mode]
             st.write(f"Found **{total_videos}** video(s) for **'{search_query}'** (sorted by {sort_label}). Starting download...")
             progress_bar = st.progress(0.0)
 
             with tempfile.TemporaryDirectory() as temp_dir:
-                subtitle_files = []
-                for i, (video_id, video_title) in enumerate(entries):
-                    video_url_item = f"https://www.youtube.com/watch?v={video_id}"
-                    try:
-                        try:
-                            sub_text, lang_code, is_auto = get_transcript_api(video_id, format_choice, sub_mode)
-                            fallback_used = False
-                        except Exception:
-                            sub_text, lang_code, is_auto = get_subtitles_yt_dlp(
-                                video_url_item, format_choice, cookies_file, temp_dir, sub_mode)
-                            fallback_used = True
-
-                        if clean_transcript:
-                            sub_text = clean_subtitle_text(sub_text)
-                        if format_choice == 'txt':
-                            sub_text = convert_srt_to_txt(sub_text)
-
-                        subtitle_files.append((video_title, sub_text))
-                        lang_name = format_language_option(lang_code)
-                        auto_note = ' (Auto-generated)' if is_auto else ''
-                        source_note = ' (via yt-dlp)' if fallback_used else ''
-                        st.info(f"✓ '{video_title}' — {lang_name}{auto_note}{source_note}")
-                    except ValueError as ve:
-                        msg = str(ve).lower()
-                        if "age-restricted" in msg or "access denied" in msg:
-                            st.warning(f"⚠️ '{video_title}' is age-restricted. Upload cookies to access.")
-                        else:
-                            st.warning(f"⚠️ No subs for '{video_title}': {str(ve)}")
-                    except Exception as e:
-                        st.warning(f"⚠️ Error for '{video_title}': {str(e)}")
-
-                    progress_bar.progress((i + 1) / total_videos)
+                results = fetch_all_subtitles(entries, format_choice, cookies_file, temp_dir,
+                                              sub_mode, clean_transcript, progress_bar)
+                subtitle_files = [(video_title, sub_text)
+                                  for (_, video_title), sub_text in zip(entries, results)
+                                  if sub_text is not None]
 
                 if not subtitle_files:
                     st.error("Nothing was downloaded.")
@@ -855,16 +1295,12 @@ def main():
                 safe_name = f"search_{search_query.strip()}"
 
                 if search_combine_choice == "combined":
-                    combined = combine_subtitles(subtitle_files, temp_dir, safe_name, format_choice)
-                    with open(combined, "rb") as f:
-                        st.download_button("📄 Download Combined File", f.read(),
-                                           os.path.basename(combined), mime_type)
+                    combined_data, combined_name = combine_subtitles(subtitle_files, safe_name, format_choice, renumber_cues)
+                    st.download_button("📄 Download Combined File", combined_data, combined_name, mime_type)
                 else:
                     zip_buffer, zip_name = create_zip(subtitle_files, safe_name, format_choice)
                     st.download_button("📦 Download ZIP", zip_buffer, zip_name, "application/zip")
 
-            if cookies_file and os.path.exists(cookies_file):
-                os.unlink(cookies_file)
             return
 
         # ── Channel + Keyword mode ──────────────────────────────────────────────
@@ -887,7 +1323,7 @@ def main():
 
             with st.spinner("Fetching channel video list..."):
                 try:
-                    entries, channel_title = get_info(channel_url_norm, True, cookies_file)
+                    entries, channel_title = get_info_cached(channel_url_norm, True, cookies_hash, cookies_file)
                 except Exception as e:
                     st.error(f"Could not fetch video list: {str(e)}")
                     return
@@ -927,38 +1363,11 @@ def main():
             progress_bar = st.progress(0.0)
 
             with tempfile.TemporaryDirectory() as temp_dir:
-                subtitle_files = []
-                for i, (video_id, video_title) in enumerate(filtered_entries):
-                    video_url_item = f"https://www.youtube.com/watch?v={video_id}"
-                    try:
-                        try:
-                            sub_text, lang_code, is_auto = get_transcript_api(video_id, format_choice, sub_mode)
-                            fallback_used = False
-                        except Exception:
-                            sub_text, lang_code, is_auto = get_subtitles_yt_dlp(
-                                video_url_item, format_choice, cookies_file, temp_dir, sub_mode)
-                            fallback_used = True
-
-                        if clean_transcript:
-                            sub_text = clean_subtitle_text(sub_text)
-                        if format_choice == 'txt':
-                            sub_text = convert_srt_to_txt(sub_text)
-
-                        subtitle_files.append((video_title, sub_text))
-                        lang_name = format_language_option(lang_code)
-                        auto_note = ' (Auto-generated)' if is_auto else ''
-                        source_note = ' (via yt-dlp)' if fallback_used else ''
-                        st.info(f"✓ '{video_title}' — {lang_name}{auto_note}{source_note}")
-                    except ValueError as ve:
-                        msg = str(ve).lower()
-                        if "age-restricted" in msg or "access denied" in msg:
-                            st.warning(f"⚠️ '{video_title}' is age-restricted. Upload cookies to access.")
-                        else:
-                            st.warning(f"⚠️ No subs for '{video_title}': {str(ve)}")
-                    except Exception as e:
-                        st.warning(f"⚠️ Error for '{video_title}': {str(e)}")
-
-                    progress_bar.progress((i + 1) / total_videos)
+                results = fetch_all_subtitles(filtered_entries, format_choice, cookies_file, temp_dir,
+                                              sub_mode, clean_transcript, progress_bar)
+                subtitle_files = [(video_title, sub_text)
+                                  for (_, video_title), sub_text in zip(filtered_entries, results)
+                                  if sub_text is not None]
 
                 if not subtitle_files:
                     st.error("Nothing was downloaded.")
@@ -969,16 +1378,12 @@ def main():
                 safe_name = f"{channel_title}_{keyword_filter}"
 
                 if keyword_combine_choice == "combined":
-                    combined = combine_subtitles(subtitle_files, temp_dir, safe_name, format_choice)
-                    with open(combined, "rb") as f:
-                        st.download_button("📄 Download Combined File", f.read(),
-                                           os.path.basename(combined), mime_type)
+                    combined_data, combined_name = combine_subtitles(subtitle_files, safe_name, format_choice, renumber_cues)
+                    st.download_button("📄 Download Combined File", combined_data, combined_name, mime_type)
                 else:
                     zip_buffer, zip_name = create_zip(subtitle_files, safe_name, format_choice)
                     st.download_button("📦 Download ZIP", zip_buffer, zip_name, "application/zip")
 
-            if cookies_file and os.path.exists(cookies_file):
-                os.unlink(cookies_file)
             return
 
         # ── Multi-Video mode ──────────────────────────────────────────────────
@@ -1009,52 +1414,30 @@ def main():
             progress_bar = st.progress(0.0)
 
             with tempfile.TemporaryDirectory() as temp_dir:
-                subtitle_files = []   # list of (video_title, sub_text)
-                # We also store channel info for txt headers
+                # Fetch metadata (title + channel) for every URL concurrently; the
+                # channel is kept for the txt headers.
+                with ThreadPoolExecutor(max_workers=min(_MAX_FETCH_WORKERS, total_videos)) as executor:
+                    meta_futures = [executor.submit(get_multi_video_info, u, cookies_file)
+                                    for u in valid_video_urls]
                 meta_list = []        # list of (video_id, title, channel)
-
-                for i, video_url_item in enumerate(valid_video_urls):
-                    video_id = extract_video_id(video_url_item)
-                    # Fetch metadata (title + channel)
+                for i, (video_url_item, future) in enumerate(zip(valid_video_urls, meta_futures)):
                     try:
-                        _, vid_title, channel_name = get_multi_video_info(video_url_item, cookies_file)
+                        meta_list.append(future.result())
                     except Exception:
-                        vid_title = f"Video {i+1}"
-                        channel_name = "Unknown Channel"
-
-                    meta_list.append((video_id, vid_title, channel_name))
+                        meta_list.append((extract_video_id(video_url_item), f"Video {i+1}", "Unknown Channel"))
 
-                    try:
-                        try:
-                            sub_text, lang_code, is_auto = get_transcript_api(video_id, format_choice, sub_mode)
-                            fallback_used = False
-                        except Exception:
-                            sub_text, lang_code, is_auto = get_subtitles_yt_dlp(
-                                video_url_item, format_choice, cookies_file, temp_dir, sub_mode)
-                            fallback_used = True
-
-                        if clean_transcript:
-                            sub_text = clean_subtitle_text(sub_text)
-                        if format_choice == 'txt':
-                            sub_text = convert_srt_to_txt(sub_text)
-                            # Prepend video title and channel name for txt
-                            sub_text = prepend_video_header(sub_text, vid_title, channel_name)
-
-                        subtitle_files.append((vid_title, sub_text))
-                        lang_name = format_language_option(lang_code)
-                        auto_note = ' (Auto-generated)' if is_auto else ''
-                        source_note = ' (yt-dlp)' if fallback_used else ''
-                        st.info(f"✓ Subs: '{vid_title}' [{channel_name}] — {lang_name}{auto_note}{source_note}")
-                    except ValueError as ve:
-                        msg = str(ve).lower()
-                        if "age-restricted" in msg or "access denied" in msg:
-                            st.warning(f"⚠️ '{vid_title}' is age-restricted. Upload cookies to access.")
-                        else:
-                            st.warning(f"⚠️ No subs for '{vid_title}': {str(ve)}")
-                    except Exception as e:
-                        st.warning(f"⚠️ Error for '{vid_title}': {str(e)}")
-
-                    progress_bar.progress((i + 1) / total_videos)
+                results = fetch_all_subtitles([(video_id, vid_title) for video_id, vid_title, _ in meta_list],
+                                              format_choice, cookies_file, temp_dir, sub_mode,
+                                              clean_transcript, progress_bar,
+                                              channels=[channel for _, _, channel in meta_list])
+                subtitle_files = []   # list of (video_title, sub_text)
+                for (_, vid_title, channel_name), sub_text in zip(meta_list, results):
+                    if sub_text is None:
+                        continue
+                    if format_choice == 'txt':
+                        # Prepend video title and channel name for txt
+                        sub_text = prepend_video_header(sub_text, vid_title, channel_name)
+                    subtitle_files.append((vid_title, sub_text))
 
                 progress_bar.progress(1.0)
 
@@ -1068,20 +1451,16 @@ def main():
                 if total_videos == 1 and subtitle_files:
                     # Single video — always just one file
                     _, sub_text = subtitle_files[0]
-                    fname = f"{sanitize_filename(subtitle_files[0][0])[:150]}.{format_choice}"
+                    fname = f"{_safe_title(subtitle_files[0][0])}.{format_choice}"
                     st.download_button("📄 Download Subtitle File",
                                        sub_text.encode('utf-8'), fname, mime_type)
                 elif multi_combine_choice == "combined":
-                    combined = combine_subtitles(subtitle_files, temp_dir, "multi_video", format_choice)
-                    with open(combined, "rb") as f:
-                        st.download_button("📄 Download Combined File", f.read(),
-                                           os.path.basename(combined), mime_type)
+                    combined_data, combined_name = combine_subtitles(subtitle_files, "multi_video", format_choice, renumber_cues)
+                    st.download_button("📄 Download Combined File", combined_data, combined_name, mime_type)
                 else:
                     zip_buffer, zip_name = create_zip(subtitle_files, "multi_video", format_choice)
                     st.download_button("📦 Download ZIP", zip_buffer, zip_name, "application/zip")
 
-            if cookies_file and os.path.exists(cookies_file):
-                os.unlink(cookies_file)
             return
 
         # ── Single / Playlist / Channel mode (unchanged) ──────────────────────
@@ -1108,15 +1487,12 @@ def main():
             selected_url = video_url_parsed
             is_playlist = False
 
-        type_label = {
-            'playlist': 'Playlist', 'channel': 'Channel',
-            'video': 'Video', 'both': 'Playlist'
-        }.get(url_type, 'URL')
+        type_label = _URL_TYPE_LABELS.get(url_type, 'URL')
         st.info(f"**{type_label}:** {selected_url}")
 
         with st.spinner("Fetching video list..."):
             try:
-                entries, playlist_title = get_info(selected_url, is_playlist, cookies_file)
+                entries, playlist_title = get_info_cached(selected_url, is_playlist, cookies_hash, cookies_file)
             except Exception as e:
                 st.error(f"Could not fetch video list: {str(e)}")
                 return
@@ -1153,38 +1529,11 @@ def main():
 
         with tempfile.TemporaryDirectory() as temp_dir:
             try:
-                subtitle_files = []
-                for i, (video_id, video_title) in enumerate(entries):
-                    video_url_item = f"https://www.youtube.com/watch?v={video_id}"
-                    try:
-                        try:
-                            sub_text, lang_code, is_auto = get_transcript_api(video_id, format_choice, sub_mode)
-                            fallback_used = False
-                        except Exception:
-                            sub_text, lang_code, is_auto = get_subtitles_yt_dlp(
-                                video_url_item, format_choice, cookies_file, temp_dir, sub_mode)
-                            fallback_used = True
-
-                        if clean_transcript:
-                            sub_text = clean_subtitle_text(sub_text)
-                        if format_choice == 'txt':
-                            sub_text = convert_srt_to_txt(sub_text)
-
-                        subtitle_files.append((video_title, sub_text))
-                        lang_name = format_language_option(lang_code)
-                        auto_note = ' (Auto-generated)' if is_auto else ''
-                        source_note = ' (yt-dlp)' if fallback_used else ''
-                        st.info(f"✓ Subs: '{video_title}' — {lang_name}{auto_note}{source_note}")
-                    except ValueError as ve:
-                        msg = str(ve).lower()
-                        if "age-restricted" in msg or "access denied" in msg:
-                            st.warning(f"⚠️ '{video_title}' is age-restricted. Upload cookies to access.")
-                        else:
-                            st.warning(f"⚠️ No subs for '{video_title}': {str(ve)}")
-                    except Exception as e:
-                        st.warning(f"⚠️ Error for '{video_title}': {str(e)}")
-
-                    progress_bar.progress((i + 1) / total_videos)
+                results = fetch_all_subtitles(entries, format_choice, cookies_file, temp_dir,
+                                              sub_mode, clean_transcript, progress_bar)
+                subtitle_files = [(video_title, sub_text)
+                                  for (_, video_title), sub_text in zip(entries, results)
+                                  if sub_text is not None]
 
                 progress_bar.progress(1.0)
 
@@ -1197,10 +1546,8 @@ def main():
 
                 if is_playlist:
                     if combine_choice == 'combined':
-                        combined = combine_subtitles(subtitle_files, temp_dir, playlist_title, format_choice)
-                        with open(combined, 'rb') as f:
-                            st.download_button("📄 Download Combined File", f.read(),
-                                               os.path.basename(combined), mime_type)
+                        combined_data, combined_name = combine_subtitles(subtitle_files, playlist_title, format_choice, renumber_cues)
+                        st.download_button("📄 Download Combined File", combined_data, combined_name, mime_type)
                     else:
                         zip_buffer, zip_name = create_zip(subtitle_files, playlist_title, format_choice)
                         st.download_button("📦 Download ZIP", zip_buffer, zip_name, "application/zip")
@@ -1208,15 +1555,12 @@ def main():
                 else:
                     if subtitle_files:
                         _, sub_text = subtitle_files[0]
-                        fname = f"{sanitize_filename(subtitle_files[0][0])[:150]}.{format_choice}"
+                        fname = f"{_safe_title(subtitle_files[0][0])}.{format_choice}"
                         st.download_button("📄 Download Subtitle File",
                                            sub_text.encode('utf-8'), fname, mime_type)
 
             except Exception as e:
                 st.error(f"Unexpected error: {str(e)}")
-            finally:
-                if cookies_file and os.path.exists(cookies_file):
-                    os.unlink(cookies_file)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# app.py is a top-level Streamlit script rather than a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
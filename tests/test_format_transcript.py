@@ -0,0 +1,37 @@
+import random
+
+import pytest
+from youtube_transcript_api import FetchedTranscript, FetchedTranscriptSnippet
+from youtube_transcript_api.formatters import SRTFormatter, WebVTTFormatter
+
+import app
+
+
+def _random_transcript(rng):
+    t = 0.0
+    snippets = []
+    for i in range(rng.randint(0, 30)):
+        # Back-to-back, overlapping and far-apart cues, with the float noise real
+        # transcripts carry in start/duration
+        t += rng.choice([0, rng.random() * 5, rng.randint(0, 4000)])
+        snippets.append(FetchedTranscriptSnippet(
+            text=rng.choice(['hi', 'two\nlines', '[Music]', 'é ♪', f'cue {i}']),
+            start=round(t, rng.choice([1, 2, 3])),
+            duration=round(rng.random() * 8, 3),
+        ))
+    return FetchedTranscript(snippets=snippets, video_id='abcdefghijk', language='English',
+                             language_code='en', is_generated=False)
+
+
+# txt is built from the SRT text, so the API path formats it as SRT first
+@pytest.mark.parametrize('format_choice, formatter', [
+    ('srt', SRTFormatter),
+    ('vtt', WebVTTFormatter),
+    ('txt', SRTFormatter),
+])
+def test_format_transcript_matches_library_formatter(format_choice, formatter):
+    rng = random.Random(format_choice)
+    for _ in range(300):
+        transcript = _random_transcript(rng)
+        expected = formatter().format_transcript(transcript)
+        assert app.format_transcript(transcript, format_choice) == expected
@@ -0,0 +1,89 @@
+import pytest
+
+import app
+
+
+def _video(video_id, title=None):
+    renderer = {'videoId': video_id}
+    if title is not None:
+        renderer['title'] = {'runs': [{'text': title}]}
+    return {'playlistVideoRenderer': renderer}
+
+
+def _more(token):
+    return {'continuationItemRenderer': {
+        'continuationEndpoint': {'continuationCommand': {'token': token}}}}
+
+
+def _first_page(items, title='My playlist'):
+    return {
+        'metadata': {'playlistMetadataRenderer': {'title': title}},
+        'contents': {'twoColumnBrowseResultsRenderer': {'tabs': [{'tabRenderer': {'content': {
+            'sectionListRenderer': {'contents': [{'itemSectionRenderer': {'contents': [
+                {'playlistVideoListRenderer': {'contents': items}}]}}]}}}}]}},
+    }
+
+
+def _continuation_page(items):
+    return {'onResponseReceivedActions': [
+        {'appendContinuationItemsAction': {'continuationItems': items}}]}
+
+
+@pytest.fixture
+def browse(monkeypatch):
+    """Serve canned browse responses keyed by browseId/continuation token."""
+    responses, calls = {}, []
+
+    def fake_browse(payload):
+        key = payload.get('browseId') or payload['continuation']
+        calls.append(key)
+        return responses[key]
+
+    monkeypatch.setattr(app, '_innertube_browse', fake_browse)
+    fake_browse.responses, fake_browse.calls = responses, calls
+    return fake_browse
+
+
+def test_single_page_without_token(browse):
+    browse.responses['VLPL1'] = _first_page([_video('aaaaaaaaaaa', 'One'), _video('bbbbbbbbbbb', 'Two')])
+    assert app.get_playlist_entries_innertube('PL1') == (
+        [('aaaaaaaaaaa', 'One'), ('bbbbbbbbbbb', 'Two')], 'My playlist')
+    assert browse.calls == ['VLPL1']
+
+
+def test_follows_continuations_across_pages(browse):
+    browse.responses['VLPL1'] = _first_page([_video('aaaaaaaaaaa', 'One'), _more('t1')], title='')
+    browse.responses['t1'] = _continuation_page([_video('bbbbbbbbbbb'), _more('t2')])
+    browse.responses['t2'] = _continuation_page([_video('ccccccccccc', 'Three')])
+    entries, title = app.get_playlist_entries_innertube('PL1')
+    # Untitled videos are numbered by their position in the whole playlist
+    assert entries == [('aaaaaaaaaaa', 'One'), ('bbbbbbbbbbb', 'video_2'), ('ccccccccccc', 'Three')]
+    assert title == 'subtitles'
+    assert browse.calls == ['VLPL1', 't1', 't2']
+
+
+def test_malformed_first_page_raises(browse):
+    browse.responses['VLPL1'] = {'contents': {'singleColumnBrowseResultsRenderer': {}}}
+    with pytest.raises(KeyError):
+        app.get_playlist_entries_innertube('PL1')
+
+
+def test_unrecognised_continuation_page_raises(browse):
+    browse.responses['VLPL1'] = _first_page([_video('aaaaaaaaaaa', 'One'), _more('t1')])
+    browse.responses['t1'] = {'onResponseReceivedActions': [
+        {'reloadContinuationItemsCommand': {'continuationItems': [_video('bbbbbbbbbbb', 'Two')]}}]}
+    with pytest.raises(KeyError):
+        app.get_playlist_entries_innertube('PL1')
+
+
+@pytest.mark.parametrize('page', [
+    {},
+    {'onResponseReceivedActions': []},
+    _continuation_page([]),
+    _continuation_page([{'messageRenderer': {}}]),
+])
+def test_truncated_continuation_raises(browse, page):
+    browse.responses['VLPL1'] = _first_page([_video('aaaaaaaaaaa', 'One'), _more('t1')])
+    browse.responses['t1'] = page
+    with pytest.raises((KeyError, IndexError, ValueError)):
+        app.get_playlist_entries_innertube('PL1')
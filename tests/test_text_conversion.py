@@ -0,0 +1,98 @@
+import random
+import re
+
+import app
+
+# The line-by-line converter convert_srt_to_txt() replaced, kept as the reference
+_OLD_CUE_INDEX_RE = re.compile(r'^\d+$')
+_OLD_SRT_TIMING_RE = re.compile(r'^\d{2}:\d{2}:\d{2}[,\.]\d{3} --> \d{2}:\d{2}:\d{2}[,\.]\d{3}$')
+_OLD_VTT_TIMING_RE = re.compile(r'^\d{2}:\d{2}:\d{2}\.\d{3} --> \d{2}:\d{2}:\d{2}\.\d{3}')
+_OLD_TAG_STRIP_RE = re.compile(r'<[\d:.]+>|</?[cv][^>]*>')
+_OLD_AD_RE = re.compile(r'\[Advertisement\].*?\n', re.DOTALL | re.IGNORECASE)
+_OLD_EXTRA_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+
+def old_convert_srt_to_txt(srt_text):
+    txt_lines = []
+    for line in srt_text.split('\n'):
+        line = line.strip()
+        if _OLD_CUE_INDEX_RE.match(line):
+            continue
+        if _OLD_SRT_TIMING_RE.match(line):
+            continue
+        if _OLD_VTT_TIMING_RE.match(line):
+            continue
+        if line.startswith('NOTE') or line.startswith('WEBVTT') or not line:
+            continue
+        line = _OLD_TAG_STRIP_RE.sub('', line)
+        if line:
+            txt_lines.append(line)
+    return '\n'.join(txt_lines) + '\n'
+
+
+def old_clean_subtitle_text(text):
+    text = _OLD_AD_RE.sub('', text)
+    text = _OLD_EXTRA_BLANK_LINES_RE.sub('\n\n', text)
+    return text.strip()
+
+
+def _timestamp(rng, sep):
+    ms = rng.randrange(10 ** 7)
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d}{sep}{ms % 1000:03d}"
+
+
+def _random_text_line(rng):
+    words = rng.choices(['hello', 'world', 'Ünïcode', 'it\'s', '42a', '-', '♪'], k=rng.randint(1, 6))
+    line = ' '.join(words)
+    roll = rng.random()
+    if roll < 0.15:
+        line = f"<c.colorE5E5E5>{line}</c>"
+    elif roll < 0.25:
+        line = f"{line}<00:00:01.500><c> more</c>"
+    elif roll < 0.3:
+        line = '[Advertisement]'
+    return rng.choice(['', ' ', '\t']) + line + rng.choice(['', ' '])
+
+
+def _random_subtitles(rng, vtt):
+    sep = '.' if vtt else ','
+    blocks = ['WEBVTT\nKind: captions\nLanguage: en'] if vtt else []
+    for i in range(rng.randint(0, 12)):
+        timing = f"{_timestamp(rng, sep)} --> {_timestamp(rng, sep)}"
+        if vtt and rng.random() < 0.3:
+            timing += ' align:start position:0%'
+        lines = [str(i + 1), timing] + [_random_text_line(rng) for _ in range(rng.randint(1, 3))]
+        if vtt and rng.random() < 0.1:
+            lines = ['NOTE a comment'] + lines
+        blocks.append('\n'.join(lines))
+    return '\n\n'.join(blocks) + rng.choice(['', '\n', '\n\n'])
+
+
+def test_convert_srt_to_txt_matches_old_loop():
+    rng = random.Random(1234)
+    for _ in range(500):
+        text = _random_subtitles(rng, vtt=rng.random() < 0.5)
+        assert app.convert_srt_to_txt(text) == old_convert_srt_to_txt(text), text
+
+
+def test_srt_to_clean_txt_matches_old_chain():
+    rng = random.Random(5678)
+    for _ in range(500):
+        text = _random_subtitles(rng, vtt=rng.random() < 0.5)
+        expected = old_convert_srt_to_txt(old_clean_subtitle_text(text))
+        assert app.srt_to_clean_txt(text) == expected, text
+        assert app.convert_srt_to_txt(app.clean_subtitle_text(text)) == expected, text
+
+
+def test_srt_to_clean_txt_drops_rest_of_line_after_mid_line_ad():
+    text = ("1\n00:00:01,000 --> 00:00:02,000\nbefore [Advertisement] sponsor\n"
+            "2\n00:00:03,000 --> 00:00:04,000\nafter\n")
+    # The old chain ate the text line's newline with the ad, gluing the next cue
+    # number onto the text; the fused pass drops it like any other cue number
+    assert old_convert_srt_to_txt(old_clean_subtitle_text(text)) == 'before 2\nafter\n'
+    assert app.srt_to_clean_txt(text) == 'before\nafter\n'
+
+
+def test_convert_srt_to_txt_empty_input():
+    assert app.convert_srt_to_txt('') == '\n'
+    assert app.srt_to_clean_txt('WEBVTT\n\n') == '\n'
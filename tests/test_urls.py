@@ -0,0 +1,72 @@
+import pytest
+
+import app
+
+VIDEO = 'https://www.youtube.com/watch?v=abcdefghijk'
+PLAYLIST = 'https://www.youtube.com/playlist?list=PLabc_123-XYZ'
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('v=abcdefghijk', ('abcdefghijk', None)),
+    ('list=PLabc_123-XYZ', (None, 'PLabc_123-XYZ')),
+    ('v=abcdefghijk&list=PLabc_123-XYZ&index=3', ('abcdefghijk', 'PLabc_123-XYZ')),
+    ('feature=share&list=PLabc_123-XYZ&v=abcdefghijk', ('abcdefghijk', 'PLabc_123-XYZ')),
+    # Only whole keys count, and the first occurrence wins as with parse_qs
+    ('vv=abcdefghijk&playlist=PLx', (None, None)),
+    ('v=abcdefghijk&v=zzzzzzzzzzz', ('abcdefghijk', None)),
+    # Percent-encoding is decoded before validating
+    ('v=abc%2Ddefghij&list=PL%5Fabc', ('abc-defghij', 'PL_abc')),
+    ('v=abcdefghij%2F', (None, None)),
+    # Malformed ids are dropped rather than passed on
+    ('v=abcdefghij', (None, None)),
+    ('v=abcdefghijkl', (None, None)),
+    ('v=abc+efghijk', (None, None)),
+    ('v=%C3%A9%C3%A9%C3%A9%C3%A9%C3%A9%C3%A9%C3%A9%C3%A9%C3%A9%C3%A9%C3%A9', (None, None)),
+    ('v=ééééééééééé&list=ééé', (None, None)),
+    ('list=../../etc', (None, None)),
+    ('v=&list=', (None, None)),
+    ('', (None, None)),
+])
+def test_query_ids(query, expected):
+    assert app._query_ids(query) == expected
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('https://youtu.be/abcdefghijk', (VIDEO, None, 'video')),
+    ('https://youtu.be/abcdefghijk?si=xyz&t=42', (VIDEO, None, 'video')),
+    ('https://youtu.be/abcdefghijk?list=PLabc_123-XYZ', (PLAYLIST, VIDEO, 'both')),
+    ('https://www.youtube.com/watch?v=abcdefghijk', (VIDEO, None, 'video')),
+    ('https://m.youtube.com/watch?feature=share&v=abcdefghijk', (VIDEO, None, 'video')),
+    ('https://www.youtube.com/watch?v=abcdefghijk&list=PLabc_123-XYZ', (PLAYLIST, VIDEO, 'both')),
+    ('https://www.youtube.com/playlist?list=PLabc_123-XYZ', (PLAYLIST, None, 'playlist')),
+    ('https://www.youtube.com/watch?v=abc%2Ddefghij', ('https://www.youtube.com/watch?v=abc-defghij', None, 'video')),
+    # A bad video id next to a good playlist id still resolves to the playlist
+    ('https://www.youtube.com/watch?v=short&list=PLabc_123-XYZ', (PLAYLIST, None, 'playlist')),
+    ('https://www.youtube.com/@SomeHandle/shorts?x=1', ('https://www.youtube.com/@SomeHandle/videos', None, 'channel')),
+    ('http://youtube.com/channel/UC123/', ('https://www.youtube.com/channel/UC123/videos', None, 'channel')),
+])
+def test_validate_url(url, expected):
+    assert app.validate_url(url) == expected
+
+
+@pytest.mark.parametrize('url', [
+    'https://youtu.be/abcdefghij',
+    'https://youtu.be/ééééééééééé',
+    'https://www.youtube.com/watch?v=abcdefghij',
+    'https://www.youtube.com/watch?v=abcdefghijk%26list%3Dx',
+    'https://www.youtube.com/watch?list=bad%20id',
+    'https://www.youtube.com/',
+])
+def test_validate_url_rejects_malformed_ids(url):
+    with pytest.raises(ValueError):
+        app.validate_url(url)
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('https://youtu.be/abcdefghijk?t=1', 'abcdefghijk'),
+    ('https://youtu.be/abcdefghij', None),
+    ('https://www.youtube.com/watch?list=PLx&v=abcdefghijk', 'abcdefghijk'),
+    ('https://www.youtube.com/watch?v=ééééééééééé', None),
+])
+def test_extract_video_id(url, expected):
+    assert app.extract_video_id(url) == expected
@@ -0,0 +1,43 @@
+import copy
+
+import app
+
+VIDEO_URL = 'https://www.youtube.com/watch?v=abcdefghijk'
+
+# What the probe's extractor would return; the subtitle carries inline 'data' so
+# yt-dlp writes the track without touching the network.
+RAW_INFO = {
+    'id': 'abcdefghijk',
+    'title': 'Test video',
+    'extractor': 'youtube',
+    'extractor_key': 'Youtube',
+    'webpage_url': VIDEO_URL,
+    'language': 'en',
+    'formats': [{'format_id': '18', 'url': 'https://example.invalid/v.mp4', 'ext': 'mp4',
+                 'vcodec': 'avc1', 'acodec': 'mp4a'}],
+    'subtitles': {'en': [{'ext': 'vtt',
+                          'data': 'WEBVTT\n\n00:00:01.000 --> 00:00:02.500\nhello there\n'}]},
+    'automatic_captions': {},
+}
+
+
+def test_fallback_writes_track_from_reused_probe_info(monkeypatch, tmp_path):
+    extractions = []
+
+    class OfflineYoutubeDL(app.YoutubeDL):
+        def extract_info(self, url, download=True, **kwargs):
+            extractions.append(url)
+            return self.process_ie_result(copy.deepcopy(RAW_INFO), download=download)
+
+    monkeypatch.setattr(app, 'YoutubeDL', OfflineYoutubeDL)
+    monkeypatch.setattr(app, '_pace_translate_requests', lambda: None)
+
+    sub_text, lang_code, is_auto = app.get_subtitles_yt_dlp(
+        VIDEO_URL, 'srt', None, str(tmp_path), 'original')
+
+    assert sub_text == '1\n00:00:01,000 --> 00:00:02,500\nhello there\n\n'
+    assert (lang_code, is_auto) == ('en', False)
+    # only the probe extracts; the download pass reuses its info dict
+    assert extractions == [VIDEO_URL]
+    # the written track is read and cleaned up
+    assert list(tmp_path.iterdir()) == []